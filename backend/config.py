@@ -13,42 +13,98 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # In production (e.g., Render), environment variables should be provided by the platform.
 load_dotenv(dotenv_path=BASE_DIR / ".env", override=False)
 
-# Database configuration
-# PostgreSQL only. Prefer setting DATABASE_URL via .env (local) or platform env vars (production).
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+psycopg2://postgres@localhost:5432/attendease")
-
-# Storage configuration
-STORAGE_TYPE = os.getenv("STORAGE_TYPE", "local")  # 'local' or 'cloudinary'
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", str(BASE_DIR / "student_images"))
-
-# Cloudinary configuration (for cloud storage)
-CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME", "")
-CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY", "")
-CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET", "")
-
-# File upload configuration
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png"}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-
-# Face recognition configuration
-FACE_RECOGNITION_TOLERANCE = float(os.getenv("FACE_RECOGNITION_TOLERANCE", "0.75"))
-FACE_EMBEDDING_MODEL = os.getenv("FACE_EMBEDDING_MODEL") or os.getenv("FACE_RECOGNITION_MODEL", "mediapipe-mesh")
-
-# Haar Cascade / detection configuration
-HAAR_CASCADE_PATH = str(BASE_DIR / "haarcascade_frontalface_default.xml")
-FACE_DETECTION_METHOD = os.getenv("FACE_DETECTION_METHOD", "mediapipe").lower()
-if FACE_DETECTION_METHOD == "auto":
-	FACE_DETECTION_METHOD = "mediapipe"
-if FACE_DETECTION_METHOD not in {"mediapipe", "haar", "both"}:
-	FACE_DETECTION_METHOD = "mediapipe"
-
-# Logging configuration
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", str(BASE_DIR / "logs" / "app.log"))
-
-# API configuration
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("API_PORT", "8000"))
-
-# CORS configuration
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+# All settings are read from the environment exactly once, when the Settings
+# singleton below is created. Consumers should import the module-level
+# constants (or `settings`) instead of calling os.getenv() again.
+_env = os.environ.get
+
+
+# Valid FACE_DETECTION_METHOD values; anything unrecognized maps to the
+# default via .get(), replacing the old if/in normalization chain.
+_DETECTION_METHODS = {
+    "mediapipe": "mediapipe",
+    "haar": "haar",
+    "both": "both",
+    "auto": "mediapipe",
+}
+
+
+class Settings:
+    """Application settings resolved once from the environment."""
+
+    def __init__(self):
+        # Database configuration
+        # PostgreSQL only. Prefer setting DATABASE_URL via .env (local) or platform env vars (production).
+        self.DATABASE_URL = _env("DATABASE_URL", "postgresql+psycopg2://postgres@localhost:5432/attendease")
+
+        # Storage configuration
+        self.STORAGE_TYPE = _env("STORAGE_TYPE", "local")  # 'local' or 'cloudinary'
+        self.UPLOAD_DIR = _env("UPLOAD_DIR", str(BASE_DIR / "student_images"))
+
+        # Cloudinary configuration (for cloud storage)
+        self.CLOUDINARY_CLOUD_NAME = _env("CLOUDINARY_CLOUD_NAME", "")
+        self.CLOUDINARY_API_KEY = _env("CLOUDINARY_API_KEY", "")
+        self.CLOUDINARY_API_SECRET = _env("CLOUDINARY_API_SECRET", "")
+
+        # File upload configuration
+        # Frozen so membership checks hash against an immutable set and the
+        # value cannot be mutated at runtime. Entries are lowercase; callers
+        # compare against `Path(filename).suffix.lower()`.
+        self.ALLOWED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+        self.MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+
+        # Face recognition configuration
+        self.FACE_RECOGNITION_TOLERANCE = float(_env("FACE_RECOGNITION_TOLERANCE", "0.75"))
+        self.FACE_EMBEDDING_MODEL = _env("FACE_EMBEDDING_MODEL") or _env("FACE_RECOGNITION_MODEL", "mediapipe-mesh")
+        # GPU device id handed to the InsightFace/ONNX Runtime pipeline;
+        # -1 keeps inference on the CPU.
+        self.FACE_GPU_ID = int(_env("FACE_GPU_ID", "-1"))
+        # Run recognition on every Nth live-video frame, redrawing the
+        # previous results in between; 1 recognizes every frame.
+        self.VIDEO_DETECT_EVERY = int(_env("VIDEO_DETECT_EVERY", "3"))
+
+        # Haar Cascade / detection configuration
+        self.HAAR_CASCADE_PATH = str(BASE_DIR / "haarcascade_frontalface_default.xml")
+        method = _env("FACE_DETECTION_METHOD", "mediapipe").lower()
+        self.FACE_DETECTION_METHOD = _DETECTION_METHODS.get(method, "mediapipe")
+
+        # Logging configuration
+        self.LOG_LEVEL = _env("LOG_LEVEL", "INFO")
+        self.LOG_FILE = _env("LOG_FILE", str(BASE_DIR / "logs" / "app.log"))
+
+        # API configuration
+        self.API_HOST = _env("API_HOST", "0.0.0.0")
+        self.API_PORT = int(_env("API_PORT", "8000"))
+
+        # CORS configuration: strip whitespace around each origin up front
+        # and freeze the result as a tuple.
+        self.ALLOWED_ORIGINS = tuple(
+            origin.strip()
+            for origin in _env("ALLOWED_ORIGINS", "*").split(",")
+            if origin.strip()
+        )
+
+
+# Singleton instance; created once at import.
+settings = Settings()
+
+# Module-level aliases kept for backward compatibility with existing imports.
+DATABASE_URL = settings.DATABASE_URL
+STORAGE_TYPE = settings.STORAGE_TYPE
+UPLOAD_DIR = settings.UPLOAD_DIR
+CLOUDINARY_CLOUD_NAME = settings.CLOUDINARY_CLOUD_NAME
+CLOUDINARY_API_KEY = settings.CLOUDINARY_API_KEY
+CLOUDINARY_API_SECRET = settings.CLOUDINARY_API_SECRET
+ALLOWED_EXTENSIONS = settings.ALLOWED_EXTENSIONS
+MAX_FILE_SIZE = settings.MAX_FILE_SIZE
+FACE_RECOGNITION_TOLERANCE = settings.FACE_RECOGNITION_TOLERANCE
+FACE_EMBEDDING_MODEL = settings.FACE_EMBEDDING_MODEL
+FACE_GPU_ID = settings.FACE_GPU_ID
+VIDEO_DETECT_EVERY = settings.VIDEO_DETECT_EVERY
+HAAR_CASCADE_PATH = settings.HAAR_CASCADE_PATH
+FACE_DETECTION_METHOD = settings.FACE_DETECTION_METHOD
+LOG_LEVEL = settings.LOG_LEVEL
+LOG_FILE = settings.LOG_FILE
+API_HOST = settings.API_HOST
+API_PORT = settings.API_PORT
+ALLOWED_ORIGINS = settings.ALLOWED_ORIGINS
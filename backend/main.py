@@ -8,7 +8,7 @@ from .logger import logger
 from .config import (
     UPLOAD_DIR, ALLOWED_EXTENSIONS, MAX_FILE_SIZE, ALLOWED_ORIGINS,
     HAAR_CASCADE_PATH, FACE_DETECTION_METHOD, FACE_RECOGNITION_TOLERANCE,
-    FACE_EMBEDDING_MODEL,
+    FACE_EMBEDDING_MODEL, FACE_GPU_ID, VIDEO_DETECT_EVERY,
     STORAGE_TYPE, CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET
 )
 import sys
@@ -48,6 +48,7 @@ face_service = FaceRecognitionService(
     haar_cascade_path=HAAR_CASCADE_PATH,
     detection_method=FACE_DETECTION_METHOD,
     embedding_model=FACE_EMBEDDING_MODEL,
+    gpu_id=FACE_GPU_ID,
 )
 ENCODINGS_FILE = "face_encodings.pkl"
 
@@ -67,7 +68,7 @@ image_storage = ImageStorageService(
 )
 
 # Initialize live video service
-live_video_service = LiveVideoService(face_service)
+live_video_service = LiveVideoService(face_service, detect_every=VIDEO_DETECT_EVERY)
 active_sessions: Dict[str, LiveRecognitionSession] = {}
 
 # Create necessary directories
@@ -4,17 +4,13 @@ Combines manual upload and live webcam features.
 """
 import streamlit as st
 import requests
-from PIL import Image
-import io
-import pandas as pd
-from datetime import datetime, timedelta
-import cv2
-import numpy as np
-import time
-import base64
+from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+# Heavy imports (PIL, pandas) are deferred to the pages that use them so
+# reruns of pages that never touch them stay fast.
+
 # Load environment variables
 load_dotenv()
 
@@ -28,8 +24,10 @@ st.set_page_config(
 # Configuration
 BACKEND_URL = st.sidebar.text_input("Backend URL", os.getenv("BACKEND_URL", "http://localhost:8000"))
 
-# Custom CSS
-st.markdown("""
+# Custom CSS, built once and reused across reruns
+@st.cache_resource(show_spinner=False)
+def page_css():
+    return """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -73,7 +71,10 @@ st.markdown("""
         border-radius: 4px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(page_css(), unsafe_allow_html=True)
 
 st.markdown('<div class="main-header">📚 AttendEase - Student Attendance System</div>', unsafe_allow_html=True)
 
@@ -94,21 +95,46 @@ for category, options in menu_categories.items():
 choice = st.sidebar.selectbox("Select Option", all_options)
 
 
-def check_backend_health():
-    """Check if backend is healthy."""
+# orjson is optional; fall back to requests' built-in JSON decoding.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_json(response):
+    """Decode a backend JSON response, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Shared requests.Session so backend calls reuse keep-alive connections."""
+    return requests.Session()
+
+
+session = get_http_session()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def check_backend_health(backend_url):
+    """Check if backend is healthy (cached for a few seconds)."""
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
+        response = session.get(f"{backend_url}/health", timeout=5)
         return response.status_code == 200
     except:
         return False
 
 
-def check_camera_status():
-    """Check if camera is active."""
+@st.cache_data(ttl=5, show_spinner=False)
+def check_camera_status(backend_url):
+    """Check if camera is active (cached for a few seconds)."""
     try:
-        response = requests.get(f"{BACKEND_URL}/live/camera/status", timeout=5)
+        response = session.get(f"{backend_url}/live/camera/status", timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             return data.get("is_active", False), data.get("active_sessions", 0)
         return False, 0
     except:
@@ -118,10 +144,11 @@ def check_camera_status():
 def start_camera():
     """Start the camera."""
     try:
-        response = requests.post(f"{BACKEND_URL}/live/camera/start", timeout=10)
+        response = session.post(f"{BACKEND_URL}/live/camera/start", timeout=10)
         if response.status_code == 200:
+            check_camera_status.clear()
             return True, "Camera started successfully"
-        return False, response.json().get("detail", "Failed to start camera")
+        return False, parse_json(response).get("detail", "Failed to start camera")
     except Exception as e:
         return False, str(e)
 
@@ -129,25 +156,52 @@ def start_camera():
 def stop_camera():
     """Stop the camera."""
     try:
-        response = requests.post(f"{BACKEND_URL}/live/camera/stop", timeout=10)
+        response = session.post(f"{BACKEND_URL}/live/camera/stop", timeout=10)
         if response.status_code == 200:
+            check_camera_status.clear()
             return True, "Camera stopped successfully"
-        return False, response.json().get("detail", "Failed to stop camera")
+        return False, parse_json(response).get("detail", "Failed to stop camera")
     except Exception as e:
         return False, str(e)
 
 
+def render_video_stream(url, height=480):
+    """Embed the MJPEG stream as a browser-side <img>.
+
+    The browser pulls frames straight from the backend instead of Streamlit
+    fetching the stream server-side and pushing frames over the WebSocket.
+    """
+    import streamlit.components.v1 as components
+
+    components.html(
+        f'<img src="{url}" style="width:100%;height:auto;" alt="Live video stream"/>',
+        height=height,
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_students(backend_url):
+    """Fetch the registered students list (cached between reruns)."""
+    response = session.get(f"{backend_url}/students/", timeout=10)
+    if response.status_code != 200:
+        return None
+    return parse_json(response)
+
+
 def handle_api_error(response):
     """Handle API error responses."""
-    try:
-        error_detail = response.json().get("detail", "Unknown error")
-    except:
-        error_detail = response.text or "Unknown error"
-    return error_detail
+    # Check the content type up front so non-JSON errors skip the decode
+    # attempt instead of steering control flow through an exception.
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            return parse_json(response).get("detail", "Unknown error")
+        except:
+            pass
+    return response.text or "Unknown error"
 
 
 # Check backend health
-if not check_backend_health():
+if not check_backend_health(BACKEND_URL):
     st.error("⚠️ Backend is not responding. Please ensure the backend server is running.")
     st.info(f"Expected backend URL: {BACKEND_URL}")
     st.stop()
@@ -156,7 +210,7 @@ if not check_backend_health():
 if "Live" in choice or "Camera" in choice:
     st.sidebar.markdown("---")
     st.sidebar.subheader("📹 Camera Control")
-    camera_status, active_sessions = check_camera_status()
+    camera_status, active_sessions = check_camera_status(BACKEND_URL)
     
     if camera_status:
         st.sidebar.success("🟢 Camera is ACTIVE")
@@ -181,8 +235,12 @@ if "Live" in choice or "Camera" in choice:
 # ========== REGISTRATION PAGES ==========
 
 if choice == "Register Student (Upload)":
+    import io
+
+    from PIL import Image
+
     st.header("📝 Register New Student (Upload Photo)")
-    
+
     col1, col2 = st.columns(2)
     
     with col1:
@@ -197,10 +255,15 @@ if choice == "Register Student (Upload)":
             help="Upload a clear photo with the student's face visible"
         )
         
+        file_bytes = None
         if file is not None:
-            image = Image.open(file)
+            # Read the upload buffer once; reuse for preview and POST
+            file_bytes = file.getvalue()
+            image = Image.open(io.BytesIO(file_bytes))
+            # Shrink the preview so large photos don't inflate the WebSocket payload
+            image.thumbnail((640, 640))
             st.image(image, caption="Uploaded Photo", use_container_width=True)
-        
+
         if st.button("Register Student", type="primary", use_container_width=True):
             if not name:
                 st.error("Please enter student name")
@@ -209,9 +272,9 @@ if choice == "Register Student (Upload)":
             else:
                 with st.spinner("Registering student..."):
                     try:
-                        files = {"file": (file.name, file.getvalue(), file.type)}
+                        files = {"file": (file.name, file_bytes, file.type)}
                         data = {"name": name}
-                        response = requests.post(
+                        response = session.post(
                             f"{BACKEND_URL}/register/",
                             files=files,
                             data=data,
@@ -219,7 +282,8 @@ if choice == "Register Student (Upload)":
                         )
                         
                         if response.status_code == 200:
-                            result = response.json()
+                            result = parse_json(response)
+                            fetch_students.clear()
                             st.success(f"✅ Student registered successfully!")
                             st.json(result)
                         else:
@@ -248,7 +312,7 @@ if choice == "Register Student (Upload)":
 elif choice == "Register Student (Live Camera)":
     st.header("📹 Register New Student (Live Camera)")
     
-    camera_active, _ = check_camera_status()
+    camera_active, _ = check_camera_status(BACKEND_URL)
     
     if not camera_active:
         st.warning("⚠️ Camera is not active. Please start the camera from the sidebar.")
@@ -258,9 +322,8 @@ elif choice == "Register Student (Live Camera)":
     
     with col1:
         st.subheader("Live Camera Feed")
-        video_placeholder = st.empty()
         video_url = f"{BACKEND_URL}/live/video/stream"
-        video_placeholder.image(video_url, use_container_width=True)
+        render_video_stream(video_url)
     
     with col2:
         st.subheader("Student Information")
@@ -274,14 +337,15 @@ elif choice == "Register Student (Live Camera)":
             else:
                 with st.spinner("Capturing and registering..."):
                     try:
-                        response = requests.post(
+                        response = session.post(
                             f"{BACKEND_URL}/live/register",
                             json={"name": name},
                             timeout=10
                         )
                         
                         if response.status_code == 200:
-                            result = response.json()
+                            result = parse_json(response)
+                            fetch_students.clear()
                             st.success(f"✅ {result['message']}")
                             if "student" in result:
                                 st.json(result["student"])
@@ -297,29 +361,27 @@ elif choice == "Mark Attendance (Manual)":
     st.header("✅ Mark Attendance (Manual Selection)")
     
     try:
-        response = requests.get(f"{BACKEND_URL}/students/", timeout=10)
-        if response.status_code == 200:
-            students = response.json()
-            
+        students = fetch_students(BACKEND_URL)
+        if students is not None:
             if not students:
                 st.warning("No students registered yet.")
             else:
                 st.subheader("Select Student")
-                student_names = [s["name"] for s in students]
-                selected_name = st.selectbox("Choose student:", student_names)
-                
+                students_by_name = {s["name"]: s for s in students}
+                selected_name = st.selectbox("Choose student:", list(students_by_name))
+
                 if st.button("Mark Attendance", type="primary"):
-                    selected_student = next(s for s in students if s["name"] == selected_name)
+                    selected_student = students_by_name[selected_name]
                     
                     try:
-                        response = requests.post(
+                        response = session.post(
                             f"{BACKEND_URL}/attendance/",
                             json={"student_id": selected_student["id"]},
                             timeout=10
                         )
                         
                         if response.status_code == 200:
-                            result = response.json()
+                            result = parse_json(response)
                             st.success(f"✅ Attendance marked for {selected_name}")
                             st.json(result)
                         else:
@@ -333,29 +395,37 @@ elif choice == "Mark Attendance (Manual)":
         st.error(f"Error: {str(e)}")
 
 elif choice == "Mark Attendance (Upload Photo)":
+    import io
+
+    from PIL import Image
+
     st.header("📸 Mark Attendance (Face Recognition - Upload)")
-    
+
     col1, col2 = st.columns(2)
     
     with col1:
         file = st.file_uploader("Upload Photo", type=["jpg", "jpeg", "png"])
         
         if file is not None:
-            image = Image.open(file)
+            # Read the upload buffer once; reuse for preview and POST
+            file_bytes = file.getvalue()
+            image = Image.open(io.BytesIO(file_bytes))
+            # Shrink the preview so large photos don't inflate the WebSocket payload
+            image.thumbnail((640, 640))
             st.image(image, caption="Uploaded Photo", use_container_width=True)
-            
+
             if st.button("Recognize & Mark Attendance", type="primary"):
                 with st.spinner("Recognizing faces..."):
                     try:
-                        files = {"file": (file.name, file.getvalue(), file.type)}
-                        response = requests.post(
+                        files = {"file": (file.name, file_bytes, file.type)}
+                        response = session.post(
                             f"{BACKEND_URL}/recognize/",
                             files=files,
                             timeout=30
                         )
                         
                         if response.status_code == 200:
-                            results = response.json()
+                            results = parse_json(response)
                             st.success(f"✅ Recognized {len(results)} face(s)")
                             
                             for result in results:
@@ -379,7 +449,7 @@ elif choice == "Mark Attendance (Upload Photo)":
 elif choice == "Mark Attendance (Live - Quick)":
     st.header("⚡ Quick Attendance (Live Camera)")
     
-    camera_active, _ = check_camera_status()
+    camera_active, _ = check_camera_status(BACKEND_URL)
     
     if not camera_active:
         st.warning("⚠️ Camera is not active. Please start the camera from the sidebar.")
@@ -389,9 +459,8 @@ elif choice == "Mark Attendance (Live - Quick)":
     
     with col1:
         st.subheader("Live Camera Feed")
-        video_placeholder = st.empty()
         video_url = f"{BACKEND_URL}/live/video/stream"
-        video_placeholder.image(video_url, use_container_width=True)
+        render_video_stream(video_url)
     
     with col2:
         st.subheader("Quick Actions")
@@ -399,13 +468,13 @@ elif choice == "Mark Attendance (Live - Quick)":
         if st.button("📸 Capture & Mark Attendance", type="primary", use_container_width=True):
             with st.spinner("Processing..."):
                 try:
-                    response = requests.post(
+                    response = session.post(
                         f"{BACKEND_URL}/live/attendance/quick",
                         timeout=10
                     )
                     
                     if response.status_code == 200:
-                        result = response.json()
+                        result = parse_json(response)
                         
                         if result["status"] == "success":
                             st.success(f"✅ Marked attendance for {result['total_marked']} student(s)")
@@ -422,7 +491,7 @@ elif choice == "Mark Attendance (Live - Quick)":
 elif choice == "Mark Attendance (Live - Session)":
     st.header("🔄 Continuous Attendance Session")
     
-    camera_active, _ = check_camera_status()
+    camera_active, _ = check_camera_status(BACKEND_URL)
     
     if not camera_active:
         st.warning("⚠️ Camera is not active. Please start the camera from the sidebar.")
@@ -439,7 +508,11 @@ elif choice == "Mark Attendance (Live - Session)":
     
     with col2:
         st.subheader("Session Control")
-        session_name = st.text_input("Session Name", value=f"Session_{datetime.now().strftime('%Y%m%d_%H%M')}")
+        # Compute the default name once per browser session; evaluating
+        # datetime.now() inline would produce a new default on every rerun.
+        if "session_name_default" not in st.session_state:
+            st.session_state.session_name_default = f"Session_{datetime.now().strftime('%Y%m%d_%H%M')}"
+        session_name = st.text_input("Session Name", value=st.session_state.session_name_default)
         
         if "session_active" not in st.session_state:
             st.session_state.session_active = False
@@ -454,7 +527,8 @@ elif choice == "Mark Attendance (Live - Session)":
                 st.rerun()
     
     if st.session_state.session_active:
-        video_placeholder.image(video_url, use_container_width=True)
+        with video_placeholder:
+            render_video_stream(video_url)
         st.success("🟢 Session is active")
     else:
         st.info("Click 'Start Session' to begin")
@@ -462,38 +536,43 @@ elif choice == "Mark Attendance (Live - Session)":
 # ========== VIEW & REPORTS PAGES ==========
 
 elif choice == "View Students":
+    import pandas as pd
+
     st.header("👥 Registered Students")
-    
+
     try:
-        response = requests.get(f"{BACKEND_URL}/students/", timeout=10)
-        
-        if response.status_code == 200:
-            students = response.json()
-            
+        students = fetch_students(BACKEND_URL)
+        if students is not None:
             if not students:
                 st.info("No students registered yet.")
             else:
                 st.success(f"Total Students: {len(students)}")
                 
-                df = pd.DataFrame(students)
+                # Build with an explicit schema so pandas skips dtype inference
+                df = pd.DataFrame.from_records(
+                    students,
+                    columns=["id", "name", "image_path", "registered_at"],
+                ).astype({"id": "int64", "name": "string", "image_path": "string"})
                 st.dataframe(df, use_container_width=True)
                 
                 # Delete student option
                 st.subheader("Delete Student")
+                students_by_name = {s["name"]: s for s in students}
                 student_to_delete = st.selectbox(
                     "Select student to delete:",
-                    options=[s["name"] for s in students]
+                    options=list(students_by_name)
                 )
-                
+
                 if st.button("Delete Student", type="secondary"):
-                    student_id = next(s["id"] for s in students if s["name"] == student_to_delete)
+                    student_id = students_by_name[student_to_delete]["id"]
                     try:
-                        del_response = requests.delete(
+                        del_response = session.delete(
                             f"{BACKEND_URL}/students/{student_id}",
                             timeout=10
                         )
                         
                         if del_response.status_code == 200:
+                            fetch_students.clear()
                             st.success(f"✅ Deleted {student_to_delete}")
                             st.rerun()
                         else:
@@ -506,49 +585,60 @@ elif choice == "View Students":
         st.error(f"Error: {str(e)}")
 
 elif choice == "View Attendance":
+    import io
+
+    import pandas as pd
+
     st.header("📋 Attendance Records")
-    
+
     col1, col2 = st.columns(2)
     
     with col1:
         date_filter = st.date_input("Filter by Date", value=datetime.now())
     
     with col2:
+        students_by_name = {}
         try:
-            response = requests.get(f"{BACKEND_URL}/students/", timeout=10)
-            if response.status_code == 200:
-                students = response.json()
-                student_names = ["All Students"] + [s["name"] for s in students]
-                student_filter = st.selectbox("Filter by Student", student_names)
+            students = fetch_students(BACKEND_URL) or []
+            students_by_name = {s["name"]: s for s in students}
+            student_names = ["All Students"] + list(students_by_name)
+            student_filter = st.selectbox("Filter by Student", student_names)
         except:
             student_filter = "All Students"
-    
+
     try:
-        response = requests.get(f"{BACKEND_URL}/attendance/", timeout=10)
-        
+        # Filter server-side instead of fetching everything and slicing in pandas
+        params = {"date": date_filter.strftime("%Y-%m-%d")}
+        if student_filter != "All Students" and student_filter in students_by_name:
+            params["student_id"] = students_by_name[student_filter]["id"]
+
+        response = session.get(f"{BACKEND_URL}/attendance/", params=params, timeout=10)
+
         if response.status_code == 200:
-            attendance_records = response.json()
-            
+            attendance_records = parse_json(response)
+
             if not attendance_records:
                 st.info("No attendance records found.")
             else:
-                df = pd.DataFrame(attendance_records)
+                # Build with an explicit schema so pandas skips dtype inference
+                df = pd.DataFrame.from_records(
+                    attendance_records,
+                    columns=["id", "student_id", "student_name", "timestamp"],
+                ).astype({"id": "int64", "student_id": "int64", "student_name": "string"})
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
-                
-                # Apply filters
-                if student_filter != "All Students":
-                    df = df[df['student_name'] == student_filter]
-                
-                df_filtered = df[df['timestamp'].dt.date == date_filter]
-                
-                st.success(f"Total Records: {len(df_filtered)}")
-                st.dataframe(df_filtered, use_container_width=True)
-                
-                # Download option
-                csv = df_filtered.to_csv(index=False)
+
+                st.success(f"Total Records: {len(df)}")
+                st.dataframe(df, use_container_width=True)
+
+                # Download option: serialize into a reusable text buffer and
+                # hand the file object to Streamlit rather than building an
+                # intermediate Python string.
+                csv_buffer = io.StringIO()
+                df.to_csv(csv_buffer, index=False)
+                csv_buffer.seek(0)
                 st.download_button(
                     label="📥 Download as CSV",
-                    data=csv,
+                    data=csv_buffer,
                     file_name=f"attendance_{date_filter}.csv",
                     mime="text/csv"
                 )
@@ -558,13 +648,15 @@ elif choice == "View Attendance":
         st.error(f"Error: {str(e)}")
 
 elif choice == "Statistics":
+    import pandas as pd
+
     st.header("📊 Attendance Statistics")
-    
+
     try:
-        response = requests.get(f"{BACKEND_URL}/attendance/stats", timeout=10)
+        response = session.get(f"{BACKEND_URL}/attendance/stats", timeout=10)
         
         if response.status_code == 200:
-            stats = response.json()
+            stats = parse_json(response)
             
             col1, col2, col3, col4 = st.columns(4)
             
@@ -593,10 +685,10 @@ elif choice == "System Health":
     st.header("🔧 System Health Check")
     
     try:
-        response = requests.get(f"{BACKEND_URL}/diagnostics", timeout=10)
+        response = session.get(f"{BACKEND_URL}/diagnostics", timeout=10)
         
         if response.status_code == 200:
-            diagnostics = response.json()
+            diagnostics = parse_json(response)
             
             st.subheader("System Status")
             st.success("✅ Backend is healthy")
@@ -639,7 +731,7 @@ elif choice == "System Health":
 elif choice == "Camera Status":
     st.header("📹 Camera Status")
     
-    camera_active, active_sessions = check_camera_status()
+    camera_active, active_sessions = check_camera_status(BACKEND_URL)
     
     if camera_active:
         st.success("🟢 Camera is ACTIVE")
@@ -647,7 +739,7 @@ elif choice == "Camera Status":
         
         st.subheader("Live Feed")
         video_url = f"{BACKEND_URL}/live/video/stream"
-        st.image(video_url, use_container_width=True)
+        render_video_stream(video_url)
     else:
         st.warning("⚫ Camera is OFF")
         st.info("Start the camera from the sidebar to view live feed.")
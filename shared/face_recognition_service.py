@@ -1,16 +1,34 @@
 """Face recognition helpers powered by InsightFace detection + embeddings."""
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import cv2
 import logging
 import numpy as np
+import os
 import pickle
-from insightface.app import FaceAnalysis
+import threading
 
 logger = logging.getLogger("attendance_app.face_recognition")
 
+# Try to import faiss for approximate nearest-neighbor search
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+# Gallery size above which an ANN index pays for itself; below this a
+# single BLAS matmul over the whole gallery is faster than index lookups.
+ANN_INDEX_MIN_GALLERY = 512
+
+# Most-recently-used embeddings kept per service for repeated path encodes.
+ENCODE_CACHE_SIZE = 256
+
 
 class FaceRecognitionService:
     """Service for face detection, encoding, and recognition without dlib."""
@@ -22,17 +40,29 @@ class FaceRecognitionService:
         detection_method: str = "insightface",
         embedding_model: str = "buffalo_l",
         det_size: Tuple[int, int] = (640, 640),
+        gpu_id: int = -1,
     ):
         self.tolerance = tolerance
         self.haar_cascade_path = haar_cascade_path
         self.embedding_model_name = embedding_model or "buffalo_l"
         self.det_size = det_size
+        # ONNX Runtime context: a CUDA device id, or -1 for CPU inference.
+        self.gpu_id = gpu_id
         self.known_face_encodings: List[np.ndarray] = []
         self.known_face_names: List[str] = []
         self.embedding_size: Optional[int] = None
+        self._known_matrix: Optional[np.ndarray] = None
+        self._gallery_slab: Optional[np.ndarray] = None
+        self._known_sq_norms: Optional[np.ndarray] = None
+        self._ann_index = None
 
         self._haar_cascade = None
-        self._insight_app: Optional[FaceAnalysis] = None
+        self._haar_gray: Optional[np.ndarray] = None
+        self._opencl_checked: Optional[bool] = None
+        self._encode_cache: "OrderedDict[Tuple[str, float, int], np.ndarray]" = OrderedDict()
+        self._encode_cache_lock = threading.Lock()
+        self._last_valid_shape: Optional[Tuple[int, int, int]] = None
+        self._insight_app: Optional["FaceAnalysis"] = None
         self._load_face_analysis()
 
         method_aliases = {
@@ -58,30 +88,89 @@ class FaceRecognitionService:
         return locations
     
     def encode_face(self, image_path: str) -> Optional[np.ndarray]:
-        """Generate an embedding for the first face in the supplied image."""
+        """Generate an embedding for the first face in the supplied image.
+
+        Successful results are memoized on (path, mtime, size), so
+        re-enrolling from an unchanged file skips the decode and the
+        inference pass entirely.
+        """
+        stat = os.stat(image_path)  # raises FileNotFoundError for missing paths
+        key = (image_path, stat.st_mtime, stat.st_size)
+        # encode_faces_batch calls this from worker threads; the lock keeps
+        # the MRU bookkeeping consistent (move_to_end racing an eviction
+        # would raise KeyError).
+        with self._encode_cache_lock:
+            cached = self._encode_cache.get(key)
+            if cached is not None:
+                self._encode_cache.move_to_end(key)
+                return cached
+
+        embedding = self._encode_first_face(self._load_image(image_path), image_path)
+        if embedding is not None:
+            with self._encode_cache_lock:
+                self._encode_cache[key] = embedding
+                if len(self._encode_cache) > ENCODE_CACHE_SIZE:
+                    self._encode_cache.popitem(last=False)
+        return embedding
 
-        if not Path(image_path).exists():
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+    def encode_face_bytes(self, data: bytes) -> Optional[np.ndarray]:
+        """Generate an embedding for the first face in raw image bytes.
 
-        image_bgr = cv2.imread(image_path)
+        Decodes straight from the in-memory buffer with cv2.imdecode, so
+        callers that already hold an upload's bytes skip the write-to-disk
+        and re-read round trip that the path-based API implies.
+        """
+        image_bgr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
         if image_bgr is None:
-            raise ValueError(f"Failed to load image: {image_path}")
+            raise ValueError("Failed to decode image bytes")
+        return self._encode_first_face(image_bgr, "<bytes>")
+
+    def encode_face_array(self, image_bgr: np.ndarray) -> Optional[np.ndarray]:
+        """Generate an embedding for the first face in a decoded BGR image.
 
+        For callers that already hold a decoded frame (uploads, batch
+        pipelines); skips the disk round trip and JPEG decode of the
+        path-based API.
+        """
+        return self._encode_first_face(self._validate_frame(image_bgr), "<array>")
+
+    def _encode_first_face(self, image_bgr: np.ndarray, source: str) -> Optional[np.ndarray]:
         face_locations, embeddings = self._run_face_analysis(image_bgr)
         if not face_locations:
-            logger.warning(f"No face detected in {image_path}")
+            logger.warning(f"No face detected in {source}")
             return None
 
         if len(face_locations) > 1:
-            logger.warning(f"Multiple faces detected in {image_path}, using first face")
+            logger.warning(f"Multiple faces detected in {source}, using first face")
 
         embedding = embeddings[0]
         if embedding is not None:
-            logger.info(f"Successfully encoded face from {image_path}")
+            logger.info(f"Successfully encoded face from {source}")
             if self.embedding_size is None:
                 self.embedding_size = embedding.shape[0]
         return embedding
     
+    def encode_faces_batch(self, image_paths: List[str], max_workers: int = 4) -> List[Optional[np.ndarray]]:
+        """Encode several images concurrently on a thread pool.
+
+        OpenCV image decoding and the ONNX Runtime inference inside
+        InsightFace both release the GIL, so worker threads overlap decode
+        and inference across images. Results preserve the order of
+        image_paths; images that fail to encode map to None.
+        """
+        def _encode(path: str) -> Optional[np.ndarray]:
+            try:
+                return self.encode_face(path)
+            except Exception as exc:
+                logger.error(f"Failed to encode {path}: {str(exc)}")
+                return None
+
+        if len(image_paths) <= 1:
+            return [_encode(path) for path in image_paths]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(image_paths))) as pool:
+            return list(pool.map(_encode, image_paths))
+
     def add_known_face(self, name: str, image_path: str) -> bool:
         """
         Add a known face to the recognition system.
@@ -98,7 +187,7 @@ class FaceRecognitionService:
             if encoding is None:
                 return False
             
-            self.known_face_encodings.append(encoding)
+            self._append_encoding(encoding)
             self.known_face_names.append(name)
             logger.info(f"Added known face for {name} from {image_path}")
             return True
@@ -106,6 +195,27 @@ class FaceRecognitionService:
             logger.error(f"Failed to add known face for {name}: {str(e)}")
             return False
     
+    def add_known_faces(self, items: List[Tuple[str, str]]) -> List[bool]:
+        """Enroll several (name, image_path) pairs in one batch.
+
+        Images are encoded concurrently through encode_faces_batch and the
+        successful embeddings appended via the gallery slab, so a bulk
+        enrollment pays one parallel encode pass plus O(1) amortized
+        inserts. Returns a per-item success flag in input order.
+        """
+        encodings = self.encode_faces_batch([path for _, path in items])
+
+        added: List[bool] = []
+        for (name, path), encoding in zip(items, encodings):
+            if encoding is None:
+                added.append(False)
+                continue
+            self._append_encoding(encoding)
+            self.known_face_names.append(name)
+            logger.info(f"Added known face for {name} from {path}")
+            added.append(True)
+        return added
+
     def recognize_face(self, image_path: str) -> List[Dict[str, any]]:
         """
         Recognize faces in an image.
@@ -117,22 +227,34 @@ class FaceRecognitionService:
             List of dictionaries with 'name', 'confidence', and 'location' for each face
         """
         try:
-            if not Path(image_path).exists():
-                raise FileNotFoundError(f"Image file not found: {image_path}")
-
-            image_bgr = cv2.imread(image_path)
-            if image_bgr is None:
-                raise ValueError(f"Failed to load image: {image_path}")
-
-            face_locations, embeddings = self._run_face_analysis(image_bgr)
-            if not face_locations:
+            image_bgr = self._load_image(image_path)
+            results = self._recognize_core(image_bgr)
+            if not results:
                 logger.warning(f"No faces detected in {image_path}")
-                return []
-            return self._match_embeddings(embeddings, face_locations)
+            return results
         except Exception as e:
             logger.error(f"Error recognizing faces in {image_path}: {str(e)}")
             raise ValueError(f"Failed to recognize faces: {str(e)}")
     
+    def recognize_face_array(self, image_bgr: np.ndarray) -> List[Dict[str, any]]:
+        """
+        Recognize faces in an already decoded BGR image.
+
+        Args:
+            image_bgr: OpenCV BGR image
+
+        Returns:
+            List of dictionaries with 'name', 'confidence', and 'location' for each face
+        """
+        try:
+            results = self._recognize_core(self._validate_frame(image_bgr))
+            if not results:
+                logger.warning("No faces detected in supplied image")
+            return results
+        except Exception as e:
+            logger.error(f"Error recognizing faces in supplied image: {str(e)}")
+            raise ValueError(f"Failed to recognize faces: {str(e)}")
+
     def recognize_from_camera(self, frame: np.ndarray) -> List[Dict[str, any]]:
         """
         Recognize faces from a camera frame using configured detection method.
@@ -144,20 +266,35 @@ class FaceRecognitionService:
             List of dictionaries with 'name', 'confidence', and 'location' for each face
         """
         try:
+            # InsightFace consumes BGR directly; no RGB conversion is needed.
             validated_frame = self._validate_frame(frame)
-            rgb_frame = cv2.cvtColor(validated_frame, cv2.COLOR_BGR2RGB)
-            if not rgb_frame.flags["C_CONTIGUOUS"]:
-                rgb_frame = np.ascontiguousarray(rgb_frame)
-
-            face_locations, embeddings = self._run_face_analysis(validated_frame)
-            if not face_locations:
+            results = self._recognize_core(validated_frame, downscale=True)
+            if not results:
                 logger.warning(f"No faces detected in frame using method: {self.detection_method}")
-                return []
-            return self._match_embeddings(embeddings, face_locations)
+            return results
         except Exception as e:
             logger.error(f"Error recognizing faces from camera: {str(e)}")
             return []
     
+    def _recognize_core(self, image_bgr: np.ndarray, downscale: bool = False) -> List[Dict[str, any]]:
+        """Detection plus matching shared by the path- and camera-based APIs.
+
+        Keeping this in one place means matcher optimizations apply to
+        both entry points and the two cannot drift apart. An empty result
+        always means no faces were found; matching never drops entries.
+        """
+        detection_frame, inv_scale = (
+            self._downscale_for_detection(image_bgr) if downscale else (image_bgr, 1.0)
+        )
+        face_locations, embeddings = self._run_face_analysis(detection_frame)
+        if inv_scale != 1.0:
+            face_locations, embeddings = self._rescale_locations(
+                face_locations, embeddings, inv_scale, image_bgr.shape
+            )
+        if not face_locations:
+            return []
+        return self._match_embeddings(embeddings, face_locations)
+
     def save_encodings(self, filepath: str) -> bool:
         """
         Save known face encodings to a file.
@@ -169,14 +306,32 @@ class FaceRecognitionService:
             True if successful, False otherwise
         """
         try:
+            # Store the embedding matrix as a raw float32 .npy next to the
+            # metadata file so it can be memory-mapped on load; only names
+            # and model info go through pickle. Both files are written to
+            # temp siblings and os.replace'd into place: _known_matrix may
+            # be the mmap of this very sidecar (load followed by save), and
+            # overwriting it directly would truncate the file under the
+            # reader mid-write and corrupt the gallery.
+            matrix_path = Path(filepath + ".npy")
+            if self.known_face_encodings:
+                tmp_matrix_path = matrix_path.with_name(matrix_path.name + ".tmp")
+                with open(tmp_matrix_path, "wb") as f:
+                    np.save(f, self._get_known_matrix())
+                os.replace(tmp_matrix_path, matrix_path)
+            elif matrix_path.exists():
+                matrix_path.unlink()
+
             data = {
-                "encodings": self.known_face_encodings,
                 "names": self.known_face_names,
                 "embedding_model": self.embedding_model_name,
                 "embedding_size": self.embedding_size,
+                "matrix_file": matrix_path.name,
             }
-            with open(filepath, "wb") as f:
+            tmp_filepath = filepath + ".tmp"
+            with open(tmp_filepath, "wb") as f:
                 pickle.dump(data, f)
+            os.replace(tmp_filepath, filepath)
             logger.info(f"Saved {len(self.known_face_names)} face encodings to {filepath}")
             return True
         except Exception as e:
@@ -194,15 +349,29 @@ class FaceRecognitionService:
             True if successful, False otherwise
         """
         try:
-            if not Path(filepath).exists():
+            try:
+                with open(filepath, "rb") as f:
+                    data = pickle.load(f)
+            except FileNotFoundError:
                 logger.warning(f"Encodings file not found: {filepath}")
                 return False
-            
-            with open(filepath, "rb") as f:
-                data = pickle.load(f)
 
-            encodings = [np.array(enc, dtype=np.float32) for enc in data.get("encodings", [])]
             names = data.get("names", [])
+            matrix = None
+
+            if data.get("matrix_file"):
+                matrix_path = Path(filepath).parent / data["matrix_file"]
+                if names and not matrix_path.exists():
+                    logger.warning(f"Encoding matrix file not found: {matrix_path}")
+                    return False
+                if names:
+                    # mmap keeps the gallery on disk; rows are views, and the
+                    # matrix itself is used directly for matching.
+                    matrix = np.load(str(matrix_path), mmap_mode="r")
+                encodings = list(matrix) if matrix is not None else []
+            else:
+                # Legacy format with the raw arrays pickled inline.
+                encodings = [np.array(enc, dtype=np.float32) for enc in data.get("encodings", [])]
 
             if encodings and data.get("embedding_size"):
                 self.embedding_size = int(data["embedding_size"])
@@ -213,6 +382,9 @@ class FaceRecognitionService:
 
             self.known_face_encodings = encodings
             self.known_face_names = names
+            self._invalidate_gallery_cache()
+            if matrix is not None and len(encodings):
+                self._known_matrix = matrix
             logger.info(f"Loaded {len(self.known_face_names)} face encodings from {filepath}")
             return True
         except Exception as e:
@@ -223,8 +395,86 @@ class FaceRecognitionService:
         """Clear all known face encodings."""
         self.known_face_encodings = []
         self.known_face_names = []
+        self._invalidate_gallery_cache()
         logger.info("Cleared all known face encodings")
 
+    def _invalidate_gallery_cache(self):
+        """Drop cached gallery-derived structures after the known faces change."""
+        self._known_matrix = None
+        self._gallery_slab = None
+        self._known_sq_norms = None
+        self._ann_index = None
+
+    def _append_encoding(self, encoding: np.ndarray):
+        """Append one encoding with amortized O(1) growth of the gallery matrix.
+
+        Encodings accumulate in a preallocated float32 slab that doubles
+        when full, so bulk enrollment never re-stacks the whole gallery
+        per add; _known_matrix stays a zero-copy view of the filled
+        prefix. The slab is (re)built on the first append after a load or
+        clear, copying any existing gallery (including an mmap-backed
+        one) into writable memory.
+        """
+        vec = np.asarray(encoding, dtype=np.float32).ravel()
+        count = len(self.known_face_encodings)
+        slab = self._gallery_slab
+
+        if slab is None or slab.shape[1] != vec.shape[0]:
+            capacity = max(64, 2 * (count + 1))
+            slab = np.empty((capacity, vec.shape[0]), dtype=np.float32)
+            if count:
+                slab[:count] = self._get_known_matrix()
+        elif count == slab.shape[0]:
+            grown = np.empty((2 * slab.shape[0], vec.shape[0]), dtype=np.float32)
+            grown[:count] = slab[:count]
+            slab = grown
+
+        slab[count] = vec
+        self._gallery_slab = slab
+        self.known_face_encodings.append(vec)
+        self._known_matrix = slab[: count + 1]
+        self._known_sq_norms = None
+        self._ann_index = None
+
+    def _get_known_matrix(self) -> np.ndarray:
+        """Return the known encodings stacked as one float32 matrix.
+
+        The stacked matrix is cached and only rebuilt after the gallery
+        changes, so recognize calls do not re-stack on every frame.
+        """
+        if self._known_matrix is None:
+            self._known_matrix = np.stack(self.known_face_encodings).astype(np.float32, copy=False)
+        return self._known_matrix
+
+    def _get_known_sq_norms(self) -> np.ndarray:
+        """Return cached ||k||^2 for every gallery row.
+
+        The squared norms only change when the gallery does, so the
+        per-frame distance expansion reuses this vector instead of
+        recomputing an O(N*dim) reduction on every recognize call.
+        """
+        if self._known_sq_norms is None:
+            self._known_sq_norms = (self._get_known_matrix() ** 2).sum(axis=1)
+        return self._known_sq_norms
+
+    def _get_ann_index(self):
+        """Return a FAISS HNSW index over the gallery, or None.
+
+        Only built when faiss is installed and the gallery is large enough
+        for sublinear search to beat the brute-force matmul. Rebuilt lazily
+        after the gallery changes.
+        """
+        if not FAISS_AVAILABLE or len(self.known_face_encodings) < ANN_INDEX_MIN_GALLERY:
+            return None
+
+        if self._ann_index is None:
+            matrix = np.ascontiguousarray(self._get_known_matrix(), dtype=np.float32)
+            index = faiss.IndexHNSWFlat(matrix.shape[1], 32)
+            index.add(matrix)
+            self._ann_index = index
+            logger.info(f"Built FAISS HNSW index over {matrix.shape[0]} encodings")
+        return self._ann_index
+
     def detect_faces_in_frame(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Detect faces from an already captured frame."""
 
@@ -237,28 +487,177 @@ class FaceRecognitionService:
             return []
 
     def _load_face_analysis(self):
+        # Imported lazily: insightface drags in onnxruntime and its model
+        # zoo machinery, a multi-second import that tools touching only the
+        # matching/persistence helpers should not pay at module import.
+        from insightface.app import FaceAnalysis
+
+        kwargs = {}
+        providers = self._onnx_providers()
+        if providers:
+            kwargs["providers"] = providers
+
         try:
-            self._insight_app = FaceAnalysis(name=self.embedding_model_name)
+            self._insight_app = FaceAnalysis(name=self.embedding_model_name, **kwargs)
         except Exception as exc:
             logger.warning(
                 "Failed to load InsightFace pack '%s': %s. Falling back to default pack.",
                 self.embedding_model_name,
                 str(exc),
             )
-            self._insight_app = FaceAnalysis()
+            self._insight_app = FaceAnalysis(**kwargs)
 
         try:
-            self._insight_app.prepare(ctx_id=-1, det_size=self.det_size)
+            self._insight_app.prepare(ctx_id=self.gpu_id, det_size=self.det_size)
         except Exception as exc:
             logger.warning(
                 "InsightFace prepare failed with det_size=%s: %s. Retrying with defaults.",
                 self.det_size,
                 str(exc),
             )
-            self._insight_app.prepare(ctx_id=-1)
+            self._insight_app.prepare(ctx_id=self.gpu_id)
         logger.info("InsightFace models loaded successfully")
 
+    def _onnx_providers(self) -> Optional[List[str]]:
+        """Choose ONNX Runtime execution providers for the requested device.
+
+        With gpu_id >= 0 and onnxruntime-gpu installed this pins the
+        pipeline to CUDA with a CPU fallback; otherwise it pins CPU
+        explicitly so a GPU build does not grab the device uninvited.
+        Returns None (insightface defaults) when onnxruntime cannot be
+        inspected.
+        """
+        try:
+            import onnxruntime
+
+            available = onnxruntime.get_available_providers()
+        except Exception:
+            return None
+
+        if self.gpu_id >= 0:
+            if "CUDAExecutionProvider" in available:
+                return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+            logger.warning(
+                "FACE_GPU_ID=%d requested but CUDAExecutionProvider is unavailable; using CPU",
+                self.gpu_id,
+            )
+        elif "CUDAExecutionProvider" in available:
+            logger.info("CUDAExecutionProvider detected; set FACE_GPU_ID to move face inference to the GPU")
+        return ["CPUExecutionProvider"]
+
+    def _downscale_for_detection(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Shrink a frame whose long side exceeds the detector input size.
+
+        InsightFace letterboxes its input down to det_size internally, so
+        detecting on a pre-shrunk frame gives the same result while making
+        the resize and hand-off much cheaper for large camera frames.
+        Returns the (possibly original) frame and the inverse scale needed
+        to map detection boxes back to the original coordinates.
+        """
+        max_det = max(self.det_size)
+        long_side = max(frame.shape[0], frame.shape[1])
+        if long_side <= max_det:
+            return frame, 1.0
+
+        scale = max_det / long_side
+        small = cv2.resize(
+            frame,
+            (int(round(frame.shape[1] * scale)), int(round(frame.shape[0] * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        return small, 1.0 / scale
+
+    def _rescale_locations(
+        self,
+        locations: List[Tuple[int, int, int, int]],
+        embeddings: List[np.ndarray],
+        inv_scale: float,
+        shape: Tuple[int, int, int],
+    ) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
+        """Map boxes detected on a downscaled frame back to full resolution.
+
+        Boxes that degenerate after rescaling are dropped together with
+        their paired embedding so the two lists stay aligned.
+        """
+        rescaled_locations = []
+        rescaled_embeddings = []
+        for (top, right, bottom, left), embedding in zip(locations, embeddings):
+            box = (
+                int(round(top * inv_scale)),
+                int(round(right * inv_scale)),
+                int(round(bottom * inv_scale)),
+                int(round(left * inv_scale)),
+            )
+            trimmed = self._trim_bbox(shape, box)
+            if trimmed is not None:
+                rescaled_locations.append(trimmed)
+                rescaled_embeddings.append(embedding)
+        return rescaled_locations, rescaled_embeddings
+
+    def _get_haar_cascade(self) -> Optional["cv2.CascadeClassifier"]:
+        """Lazily load the Haar cascade once and reuse it across calls."""
+        if self._haar_cascade is None and self.haar_cascade_path:
+            cascade_cls = getattr(cv2, "CascadeClassifier", None)
+            if cascade_cls is None:
+                logger.warning("cv2.CascadeClassifier unavailable in this OpenCV build")
+                self.haar_cascade_path = None
+                return None
+            cascade = cascade_cls(self.haar_cascade_path)
+            if cascade.empty():
+                logger.warning(f"Failed to load Haar cascade from {self.haar_cascade_path}")
+                self.haar_cascade_path = None
+                return None
+            self._haar_cascade = cascade
+        return self._haar_cascade
+
+    def detect_faces_haar(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Cheap Haar-based detection, usable as a fast frame gate.
+
+        Boxes are returned in the same (top, right, bottom, left) order as
+        the InsightFace path. The classifier is cached by _get_haar_cascade
+        rather than re-parsing the cascade XML on every frame.
+        """
+        cascade = self._get_haar_cascade()
+        if cascade is None:
+            return []
+
+        validated = self._validate_frame(frame)
+        if self._opencl_available():
+            # Route through the T-API so the grayscale conversion and the
+            # cascade's sliding-window evaluation run on the OpenCL device.
+            gray = cv2.cvtColor(cv2.UMat(validated), cv2.COLOR_BGR2GRAY)
+        else:
+            # Convert into a reused buffer so repeated gate calls at
+            # stream rate do not allocate a fresh grayscale plane.
+            if self._haar_gray is None or self._haar_gray.shape != validated.shape[:2]:
+                self._haar_gray = np.empty(validated.shape[:2], dtype=np.uint8)
+            gray = cv2.cvtColor(validated, cv2.COLOR_BGR2GRAY, dst=self._haar_gray)
+        rects = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+        return [(int(y), int(x + w), int(y + h), int(x)) for (x, y, w, h) in rects]
+
+    def _opencl_available(self) -> bool:
+        """Check once whether OpenCV can dispatch work to an OpenCL device."""
+        if self._opencl_checked is None:
+            try:
+                self._opencl_checked = bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+            except Exception:
+                self._opencl_checked = False
+            if self._opencl_checked:
+                logger.info("OpenCL available; Haar detection will use the T-API")
+        return self._opencl_checked
+
     def _validate_frame(self, frame: np.ndarray) -> np.ndarray:
+        # Steady-state camera capture delivers identical uint8 contiguous
+        # frames every call; match against the last validated shape and
+        # skip straight through.
+        if (
+            type(frame) is np.ndarray
+            and frame.shape == self._last_valid_shape
+            and frame.dtype == np.uint8
+            and frame.flags["C_CONTIGUOUS"]
+        ):
+            return frame
+
         if frame is None or not isinstance(frame, np.ndarray) or frame.size == 0:
             raise ValueError("Invalid frame provided")
 
@@ -266,14 +665,16 @@ class FaceRecognitionService:
             raise ValueError(f"Invalid frame shape: {frame.shape}")
 
         if frame.dtype != np.uint8:
-            if frame.max() <= 1.0:
-                frame = (frame * 255).astype(np.uint8)
-            else:
-                frame = np.clip(frame, 0, 255).astype(np.uint8)
+            # One fused scale/clamp/cast instead of two branch-specific
+            # temporary-heavy paths; clamping also keeps stray negatives
+            # in normalized-float input from wrapping on the uint8 cast.
+            scale = 255.0 if float(frame.max()) <= 1.0 else 1.0
+            frame = np.clip(frame * scale, 0, 255).astype(np.uint8)
 
         if not frame.flags["C_CONTIGUOUS"]:
             frame = np.ascontiguousarray(frame)
 
+        self._last_valid_shape = frame.shape
         return frame
 
     def _run_face_analysis(self, frame_bgr: np.ndarray) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
@@ -285,19 +686,61 @@ class FaceRecognitionService:
         locations: List[Tuple[int, int, int, int]] = []
         embeddings: List[np.ndarray] = []
 
-        for face in faces:
-            x1, y1, x2, y2 = face.bbox.astype(int)
-            trimmed = self._trim_bbox(validated.shape, (y1, x2, y2, x1))
-            if trimmed is None:
-                continue
-            locations.append(trimmed)
-            embeddings.append(np.array(face.embedding, dtype=np.float32))
+        if faces:
+            # Clip every bbox to the frame in one vectorized pass instead
+            # of trimming per face in Python; degenerate boxes are masked
+            # out together with their embeddings.
+            h, w = validated.shape[0], validated.shape[1]
+            boxes = np.rint([face.bbox for face in faces]).astype(np.int64)
+            np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+            np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+            valid = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+
+            for i in np.flatnonzero(valid):
+                x1, y1, x2, y2 = boxes[i]
+                locations.append((int(y1), int(x2), int(y2), int(x1)))
+                embeddings.append(np.array(faces[i].embedding, dtype=np.float32))
+
+        locations, embeddings = self._deduplicate_locations(locations, embeddings)
 
         if self.embedding_size is None and embeddings:
             self.embedding_size = embeddings[0].shape[0]
 
         return locations, embeddings
 
+    @staticmethod
+    def _deduplicate_locations(
+        locations: List[Tuple[int, int, int, int]],
+        embeddings: List[np.ndarray],
+        iou_threshold: float = 0.5,
+    ) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
+        """Suppress overlapping detections with a vectorized IoU filter.
+
+        Each kept box suppresses all remaining boxes in one array pass
+        (larger boxes win), instead of comparing box pairs in Python.
+        """
+        if len(locations) < 2:
+            return locations, embeddings
+
+        boxes = np.asarray(locations, dtype=np.float32)
+        tops, rights, bottoms, lefts = boxes.T
+        areas = (bottoms - tops) * (rights - lefts)
+
+        keep = []
+        suppressed = np.zeros(len(locations), dtype=bool)
+        for idx in np.argsort(-areas):
+            if suppressed[idx]:
+                continue
+            keep.append(int(idx))
+            inter_h = np.minimum(bottoms, bottoms[idx]) - np.maximum(tops, tops[idx])
+            inter_w = np.minimum(rights, rights[idx]) - np.maximum(lefts, lefts[idx])
+            inter = np.clip(inter_h, 0, None) * np.clip(inter_w, 0, None)
+            iou = inter / (areas + areas[idx] - inter + 1e-6)
+            suppressed |= iou > iou_threshold
+
+        keep.sort()
+        return [locations[i] for i in keep], [embeddings[i] for i in keep]
+
     def _trim_bbox(self, shape: Tuple[int, int, int], box: Tuple[int, int, int, int]) -> Optional[Tuple[int, int, int, int]]:
         h, w = shape[0], shape[1]
         top, right, bottom, left = box
@@ -313,10 +756,11 @@ class FaceRecognitionService:
 
     @staticmethod
     def _load_image(image_path: str) -> np.ndarray:
-        if not Path(image_path).exists():
-            raise FileNotFoundError(f"Image file not found: {image_path}")
-
-        image_bgr = cv2.imread(image_path)
+        # np.fromfile + imdecode rather than cv2.imread: missing files
+        # raise FileNotFoundError directly instead of a silent None, and
+        # non-ASCII paths decode correctly on every platform.
+        buffer = np.fromfile(image_path, dtype=np.uint8)
+        image_bgr = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
         if image_bgr is None:
             raise ValueError(f"Failed to load image: {image_path}")
         return image_bgr
@@ -337,25 +781,49 @@ class FaceRecognitionService:
             logger.warning("No known face encodings loaded; all matches will be Unknown")
             return results
 
-        known_matrix = np.stack(self.known_face_encodings)
+        known_matrix = self._get_known_matrix()
 
-        for embedding, location in zip(embeddings, locations):
-            if embedding is None:
-                results.append({"name": "Unknown", "confidence": 0.0, "location": location})
-                continue
+        names = ["Unknown"] * len(locations)
+        confidences = [0.0] * len(locations)
 
-            distances = np.linalg.norm(known_matrix - embedding, axis=1)
-            best_index = int(np.argmin(distances))
-            best_distance = float(distances[best_index])
+        valid_indices = [i for i, emb in enumerate(embeddings) if emb is not None]
+        if valid_indices:
+            probes = np.stack(
+                [np.asarray(embeddings[i], dtype=np.float32) for i in valid_indices]
+            )
 
-            if best_distance <= self.tolerance:
-                name = self.known_face_names[best_index]
-                confidence = max(0.0, 1.0 - (best_distance / max(self.tolerance, 1e-6)))
+            ann_index = self._get_ann_index()
+            if ann_index is not None:
+                # Sublinear nearest-neighbor lookup for large galleries.
+                sq_distances, best_rows = ann_index.search(np.ascontiguousarray(probes), 1)
+                best_rows = best_rows[:, 0]
+                best_distances = np.sqrt(np.maximum(sq_distances[:, 0], 0.0))
             else:
-                name = "Unknown"
-                confidence = 0.0
-
-            results.append({"name": name, "confidence": float(confidence), "location": location})
+                # ||k - p||^2 = ||k||^2 - 2 k.p + ||p||^2, so one matmul
+                # covers every probe against the whole gallery at once;
+                # the gallery norms are cached across frames.
+                sq_distances = (
+                    self._get_known_sq_norms()[:, None]
+                    - 2.0 * (known_matrix @ probes.T)
+                    + (probes ** 2).sum(axis=1)[None, :]
+                )
+                distances = np.sqrt(np.maximum(sq_distances, 0.0, out=sq_distances))
+                best_rows = distances.argmin(axis=0)
+                best_distances = distances[best_rows, np.arange(len(valid_indices))]
+
+            # Confidences for all probes in one vectorized pass; the loop
+            # below only assigns names for the probes inside tolerance.
+            inv_tolerance = 1.0 / max(self.tolerance, 1e-6)
+            within = best_distances <= self.tolerance
+            probe_confidences = np.maximum(0.0, 1.0 - best_distances * inv_tolerance)
+
+            for col, i in enumerate(valid_indices):
+                if within[col]:
+                    names[i] = self.known_face_names[int(best_rows[col])]
+                    confidences[i] = float(probe_confidences[col])
+
+        for i, location in enumerate(locations):
+            results.append({"name": names[i], "confidence": float(confidences[i]), "location": location})
 
         return results
 
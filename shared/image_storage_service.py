@@ -3,6 +3,7 @@ Image storage service supporting both local filesystem and Cloudinary cloud stor
 """
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 import io
@@ -20,6 +21,13 @@ except ImportError:
     CLOUDINARY_AVAILABLE = False
     logger.warning("Cloudinary not available. Using local storage only.")
 
+# Try to import Pillow on its own for downscaling oversized uploads
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 
 class ImageStorageService:
     """Service for storing and retrieving images (local or cloud)."""
@@ -36,7 +44,9 @@ class ImageStorageService:
         """
         self.storage_type = storage_type.lower()
         self.upload_dir = upload_dir
-        
+        # Small pool so the local backup write can overlap the network upload
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+
         # Ensure local directory exists
         os.makedirs(upload_dir, exist_ok=True)
         
@@ -59,19 +69,24 @@ class ImageStorageService:
         
         logger.info(f"Image storage initialized: {self.storage_type}")
     
-    def save_image(self, file_content: bytes, student_name: str, filename: str) -> Tuple[bool, str]:
+    def save_image(self, file_content: bytes, student_name: str, filename: str,
+                   max_edge: int = 1280) -> Tuple[bool, str]:
         """
         Save an image to storage.
-        
+
         Args:
             file_content: Image file bytes
             student_name: Student name (for folder/tag)
             filename: Original filename
-            
+            max_edge: Longest allowed image edge; bigger uploads are
+                downscaled and re-encoded before storage (0 disables)
+
         Returns:
             Tuple of (success: bool, path_or_url: str)
         """
         try:
+            if max_edge:
+                file_content = self._shrink_oversized(file_content, max_edge)
             if self.storage_type == "cloudinary":
                 return self._save_to_cloudinary(file_content, student_name, filename)
             else:
@@ -84,6 +99,39 @@ class ImageStorageService:
                 return self._save_to_local(file_content, student_name, filename)
             return False, ""
     
+    def _shrink_oversized(self, file_content: bytes, max_edge: int) -> bytes:
+        """Downscale and re-encode an image whose longest edge exceeds max_edge.
+
+        Phone cameras emit multi-megapixel JPEGs, but recognition works
+        from far smaller inputs — storing the original only inflates
+        disk/Cloudinary usage and every later decode. Returns the
+        original bytes unchanged when Pillow is unavailable, the image
+        is already small enough, or decoding fails.
+        """
+        if not PIL_AVAILABLE:
+            return file_content
+        try:
+            image = Image.open(io.BytesIO(file_content))
+            if max(image.size) <= max_edge:
+                return file_content
+
+            # Bake the EXIF orientation into the pixels before resizing:
+            # re-encoding strips the tag, and phone portrait photos would
+            # otherwise be stored sideways (cv2 decoders honor the tag).
+            image = ImageOps.exif_transpose(image)
+
+            original_size = image.size
+            image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=88)
+            logger.info(f"Downscaled upload from {original_size} to {image.size} before storage")
+            return buffer.getvalue()
+        except Exception as e:
+            logger.warning(f"Could not downscale image, storing original: {str(e)}")
+            return file_content
+
     def _save_to_local(self, file_content: bytes, student_name: str, filename: str) -> Tuple[bool, str]:
         """Save image to local filesystem."""
         try:
@@ -104,6 +152,13 @@ class ImageStorageService:
     def _save_to_cloudinary(self, file_content: bytes, student_name: str, filename: str) -> Tuple[bool, str]:
         """Save image to Cloudinary."""
         try:
+            # The local cache/backup write is disk-bound and independent of
+            # the network upload, so run it concurrently; the caller waits
+            # for max(upload, disk) instead of their sum.
+            local_future = self._io_pool.submit(
+                self._save_to_local, file_content, student_name, filename
+            )
+
             # Upload to cloudinary with student name as folder and tag
             upload_result = cloudinary.uploader.upload(
                 file_content,
@@ -113,13 +168,12 @@ class ImageStorageService:
                 overwrite=True,
                 resource_type="image"
             )
-            
+
             url = upload_result.get("secure_url")
             logger.info(f"Saved image to Cloudinary: {url}")
-            
-            # Also save locally as cache/backup
-            self._save_to_local(file_content, student_name, filename)
-            
+
+            local_future.result()
+
             return True, url
         except Exception as e:
             logger.error(f"Error saving to Cloudinary: {str(e)}")
@@ -15,16 +15,37 @@ logger = logging.getLogger("attendance_app.live_video")
 class LiveVideoService:
     """Service for live video streaming and real-time face recognition."""
     
-    def __init__(self, face_service):
+    def __init__(self, face_service, motion_threshold: float = 2.0, detect_every: int = 1):
         """
         Initialize live video service.
-        
+
         Args:
             face_service: FaceRecognitionService instance for recognition
+            motion_threshold: Mean pixel difference below which a frame is
+                considered unchanged and recognition is skipped
+            detect_every: Run recognition only on every Nth frame, reusing
+                the previous results (and boxes) in between; 1 means every
+                frame
         """
         self.face_service = face_service
         self.camera = None
         self.is_active = False
+        self.motion_threshold = motion_threshold
+        self.detect_every = max(1, detect_every)
+        self._frame_index = 0
+        # Scratch buffers for the motion gate, reused across frames so the
+        # per-frame resize/convert/diff does not allocate.
+        self._gate_small = np.empty((120, 160, 3), dtype=np.uint8)
+        self._gate_gray = np.empty((120, 160), dtype=np.uint8)
+        self._gate_diff = np.empty((120, 160), dtype=np.uint8)
+        self._last_gate_gray = None
+        self._last_results: List[Dict] = []
+        # Small ring of capture buffers handed to VideoCapture.read so
+        # OpenCV writes frames into existing allocations. A ring (rather
+        # than one buffer) keeps the previous frame valid while downstream
+        # stages are still looking at it.
+        self._capture_buffers: List[Optional[np.ndarray]] = [None, None, None]
+        self._capture_index = 0
         logger.info("Initialized LiveVideoService")
     
     def start_camera(self, camera_index: int = 0) -> bool:
@@ -85,11 +106,20 @@ class LiveVideoService:
         """
         if self.camera is None or not self.is_active:
             return None
-        
-        ret, frame = self.camera.read()
+
+        index = self._capture_index
+        self._capture_index = (index + 1) % len(self._capture_buffers)
+        buffer = self._capture_buffers[index]
+        if buffer is not None:
+            ret, frame = self.camera.read(buffer)
+        else:
+            ret, frame = self.camera.read()
         if not ret or frame is None:
             logger.warning("Failed to read frame from camera")
             return None
+
+        # Remember the (possibly newly allocated) array for reuse next cycle
+        self._capture_buffers[index] = frame
         
         # Validate frame is numpy array
         if not isinstance(frame, np.ndarray):
@@ -138,8 +168,18 @@ class LiveVideoService:
             Dictionary with recognition results and processed frame
         """
         try:
-            # Recognize faces in the frame
-            results = self.face_service.recognize_from_camera(frame)
+            # Skip the recognition pipeline when the scene has not changed
+            # since the previous frame, or on in-between frames when a
+            # detection cadence is configured; reuse the last results. At
+            # 30 fps the boxes drift by only a few pixels between
+            # keyframes, which the label overlay tolerates.
+            self._frame_index += 1
+            is_keyframe = self._frame_index % self.detect_every == 0
+            if self._scene_unchanged(frame) or (not is_keyframe and self._last_results):
+                results = self._last_results
+            else:
+                results = self.face_service.recognize_from_camera(frame)
+                self._last_results = results
             
             # Draw bounding boxes and labels if requested
             if draw_boxes:
@@ -183,6 +223,26 @@ class LiveVideoService:
                 "error": str(e)
             }
     
+    def _scene_unchanged(self, frame: np.ndarray) -> bool:
+        """Frame-differencing gate: True when the scene is effectively static.
+
+        Compares a small grayscale version of the frame against the previous
+        one; a mean absolute difference below motion_threshold means nothing
+        moved enough to warrant re-running detection and recognition.
+        """
+        cv2.resize(frame, (160, 120), dst=self._gate_small, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(self._gate_small, cv2.COLOR_BGR2GRAY, dst=self._gate_gray)
+
+        previous = self._last_gate_gray
+        if previous is None:
+            self._last_gate_gray = gray.copy()
+            return False
+
+        cv2.absdiff(gray, previous, dst=self._gate_diff)
+        unchanged = float(self._gate_diff.mean()) < self.motion_threshold
+        np.copyto(previous, gray)
+        return unchanged
+
     def generate_video_stream(self) -> Generator[bytes, None, None]:
         """
         Generate video stream for web streaming (MJPEG format).
@@ -0,0 +1,118 @@
+"""
+Save/load round-trip tests for the face encoding gallery format.
+"""
+import pickle
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared.face_recognition_service import FaceRecognitionService
+
+
+def make_service():
+    """Build a service without the InsightFace pipeline.
+
+    Persistence only touches the gallery fields, so the tests skip the
+    model download that a normal constructor call would trigger.
+    """
+    service = FaceRecognitionService.__new__(FaceRecognitionService)
+    service.known_face_encodings = []
+    service.known_face_names = []
+    service.embedding_size = None
+    service.embedding_model_name = "buffalo_l"
+    service._known_matrix = None
+    service._gallery_slab = None
+    service._known_sq_norms = None
+    service._ann_index = None
+    return service
+
+
+def populate(service, count=5, dim=512, seed=0):
+    """Fill a service with deterministic random encodings."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        service._append_encoding(rng.normal(size=dim).astype(np.float32))
+        service.known_face_names.append(f"student{i}")
+    service.embedding_size = dim
+
+
+class TestEncodingPersistence:
+    """Tests for the .pkl metadata + .npy matrix sidecar format."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        """Saved galleries load back with identical names and vectors."""
+        service = make_service()
+        populate(service)
+        path = str(tmp_path / "face_encodings.pkl")
+        assert service.save_encodings(path)
+
+        loaded = make_service()
+        assert loaded.load_encodings(path)
+        assert loaded.known_face_names == service.known_face_names
+        assert np.array_equal(loaded._get_known_matrix(), service._get_known_matrix())
+
+    def test_save_after_load_does_not_corrupt(self, tmp_path):
+        """Re-saving while the matrix is mmap'd from the sidecar is safe."""
+        service = make_service()
+        populate(service)
+        path = str(tmp_path / "face_encodings.pkl")
+        assert service.save_encodings(path)
+
+        reloaded = make_service()
+        assert reloaded.load_encodings(path)
+        # _known_matrix is now the mmap of the sidecar being overwritten
+        assert reloaded.save_encodings(path)
+
+        verify = make_service()
+        assert verify.load_encodings(path)
+        assert verify.known_face_names == service.known_face_names
+        assert np.array_equal(verify._get_known_matrix(), service._get_known_matrix())
+
+    def test_save_load_empty_gallery(self, tmp_path):
+        """An empty gallery round-trips and removes a stale sidecar."""
+        service = make_service()
+        populate(service)
+        path = str(tmp_path / "face_encodings.pkl")
+        assert service.save_encodings(path)
+
+        service.clear_known_faces()
+        assert service.save_encodings(path)
+        assert not (tmp_path / "face_encodings.pkl.npy").exists()
+
+        loaded = make_service()
+        assert loaded.load_encodings(path)
+        assert loaded.known_face_names == []
+        assert loaded.known_face_encodings == []
+
+    def test_legacy_inline_pickle_loads(self, tmp_path):
+        """Pre-sidecar pickles with inline encodings still load."""
+        path = tmp_path / "face_encodings.pkl"
+        encoding = np.ones(512, dtype=np.float32)
+        with open(path, "wb") as f:
+            pickle.dump(
+                {
+                    "names": ["legacy"],
+                    "encodings": [encoding.tolist()],
+                    "embedding_size": 512,
+                },
+                f,
+            )
+
+        loaded = make_service()
+        assert loaded.load_encodings(str(path))
+        assert loaded.known_face_names == ["legacy"]
+        assert np.array_equal(loaded._get_known_matrix(), encoding[None, :])
+
+    def test_load_missing_file_returns_false(self, tmp_path):
+        """Loading a nonexistent path reports failure without raising."""
+        service = make_service()
+        assert service.load_encodings(str(tmp_path / "missing.pkl")) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])